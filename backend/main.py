@@ -1,13 +1,15 @@
 from fastapi import FastAPI
 from loguru import logger
+from backend.src.models.cascade import CASCADE_MODEL_PATH, CascadeClassifier
 from backend.src.models.models import SentimentOut, TextIn
-from src.routers import fine_tuning
+from src.routers import cascade_training, fine_tuning
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 import os
 
 app = FastAPI()
 
 app.include_router(fine_tuning.router)
+app.include_router(cascade_training.router)
 model_dir =  os.path.join('..', 'models', 'finbert_bitcoin_sentiment_pretrained')
 tokenizer = AutoTokenizer.from_pretrained(model_dir)
 model = AutoModelForSequenceClassification.from_pretrained(model_dir)
@@ -19,6 +21,30 @@ sentiment_pipeline = pipeline(
     device=0
 )
 
+cascade = None
+cascade_mtime = None
+
+
+def get_cascade():
+    """
+    Return the cascade model, reloading it whenever /cascade-training (or any
+    other run) rewrites the file, so no restart is needed.
+    """
+    global cascade, cascade_mtime
+    try:
+        mtime = os.path.getmtime(CASCADE_MODEL_PATH)
+    except FileNotFoundError:
+        return None
+    if mtime != cascade_mtime:
+        cascade = CascadeClassifier.load(CASCADE_MODEL_PATH)
+        cascade_mtime = mtime
+        logger.info(f"Loaded cascade model from {CASCADE_MODEL_PATH} (threshold {cascade.threshold:.4f})")
+    return cascade
+
+
+if get_cascade() is None:
+    logger.warning(f"No cascade model at {CASCADE_MODEL_PATH} yet, cascade requests will use FinBERT only")
+
 @app.get("/")
 async def root():
     logger.debug("That's it, beautiful and simple logging!")
@@ -27,8 +53,15 @@ async def root():
 
 @app.post("/predict", response_model=SentimentOut)
 def predict(payload: TextIn):
+    cascade_model = get_cascade() if payload.mode == "cascade" else None
+    if cascade_model is not None:
+        prediction = cascade_model.predict(payload.text)
+        if prediction is not None:
+            label, score = prediction
+            return SentimentOut(label=label, score=score, stage="linear")
+
     result = sentiment_pipeline(payload.text)[0]
-    return SentimentOut(label=result["label"], score=result["score"])
+    return SentimentOut(label=result["label"], score=result["score"], stage="finbert")
 
 
 if __name__ == "__main__":
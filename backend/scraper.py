@@ -1,19 +1,30 @@
-import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 import psycopg2
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from transformers import AutoTokenizer
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 
 from backend.main import predict
+from backend.src.dedup.near_duplicates import NearDuplicateIndex, article_fingerprint
 from backend.src.models.models import TextIn
+from backend.src.scraping.browser_pool import BrowserPool
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Same default location as the preprocessing notebooks, so the labeled corpus index is reused
+CLEAN_DATA_FOLDER = os.getenv("CLEAN_DATA_FOLDER", "/data/clean")
+NEAR_DUP_INDEX_PATH = os.getenv("NEAR_DUP_INDEX_PATH", os.path.join(CLEAN_DATA_FOLDER, 'near_duplicate_index.npz'))
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+NEAR_DUP_NUM_PERM = int(os.getenv("NEAR_DUP_NUM_PERM", "128"))
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+
+# Selectors waited on before parsing, instead of sleeping a fixed time
+HEADLINES_SELECTOR = 'div[class^="sc-4c05d6ef-0"] a[href]'
+ARTICLE_TITLE_SELECTOR = 'h1.sc-21d469ac-7'
+
 def get_db_connection():
     """Create a connection to the PostgreSQL database."""
     try:
@@ -47,9 +58,11 @@ def create_tables():
                         assets TEXT,
                         article_content TEXT,
                         prediction TEXT,
+                        canonical_url TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
+                cur.execute('ALTER TABLE articles ADD COLUMN IF NOT EXISTS canonical_url TEXT')
         print("✅ Database tables ready")
         return True
     except Exception as e:
@@ -85,15 +98,16 @@ def save_article_to_db(article_data):
         with conn:
             with conn.cursor() as cur:
                 cur.execute('''
-                    INSERT INTO articles (url, title, author, assets, article_content, prediction)
-                    VALUES (%s, %s, %s, %s, %s, %s)
+                    INSERT INTO articles (url, title, author, assets, article_content, prediction, canonical_url)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
                 ''', (
                     article_data['url'],
                     article_data['title'],
                     article_data['author'],
                     article_data['assets'],
                     article_data['article_content'],
-                    article_data.get('prediction')  # Handle prediction if available
+                    article_data.get('prediction'),  # Handle prediction if available
+                    article_data.get('canonical_url')
                 ))
         return True
     except Exception as e:
@@ -113,22 +127,18 @@ def scrape_full_coinmarketcap_articles():
 
     headlines_url = "https://coinmarketcap.com/headlines/news/"
 
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    near_dup_index = NearDuplicateIndex.load_or_create(
+        NEAR_DUP_INDEX_PATH,
+        threshold=NEAR_DUP_THRESHOLD,
+        num_perm=NEAR_DUP_NUM_PERM
+    )
 
+    pool = None
     all_articles_data = []
 
     try:
-        driver.get(headlines_url)
-        time.sleep(3)
-
-        page_soup = BeautifulSoup(driver.page_source, 'html.parser')
+        pool = BrowserPool(size=BROWSER_POOL_SIZE)
+        page_soup = BeautifulSoup(pool.get_page_source(headlines_url, HEADLINES_SELECTOR), 'html.parser')
         article_links = []
         articles = page_soup.find_all('div', class_=lambda x: x and x.startswith('sc-4c05d6ef-0'))
 
@@ -148,17 +158,23 @@ def scrape_full_coinmarketcap_articles():
                         article_links.append(full_url)
         article_links = list(set(article_links))
         print(f"✅ Found {len(article_links)} articles. Fetching details for the first 3 as a demo...")
+        new_links = []
         for url in article_links[:3]:  # Limiting to 3 for demonstration
             # Check if article already exists in database
             if is_article_in_db(url):
                 print(f"\n Article already saved: {url}")
                 continue
+            new_links.append(url)
+
+        # Pages are rendered concurrently by the pool, then parsed and scored in order
+        with ThreadPoolExecutor(max_workers=BROWSER_POOL_SIZE) as executor:
+            pages = {url: executor.submit(pool.get_page_source, url, ARTICLE_TITLE_SELECTOR) for url in new_links}
 
+        for url in new_links:
             print(f"\n Scraping article: {url}")
-            driver.get(url)
 
             try:
-                article_soup = BeautifulSoup(driver.page_source, 'html.parser')
+                article_soup = BeautifulSoup(pages[url].result(), 'html.parser')
                 title_element = article_soup.find('h1', class_='sc-21d469ac-7')
                 title = title_element.get_text(strip=True) if title_element else "Title not found"
 
@@ -187,6 +203,13 @@ def scrape_full_coinmarketcap_articles():
                 if is_article_in_db(url):
                     print("  ⚠️ Article already exists in database, skipping save.")
                     continue
+
+                # Syndicated copies inherit the prediction of their cluster
+                dedup_text = article_fingerprint(title, article_content)
+                match = near_dup_index.query(dedup_text)
+                if match and match.prediction is not None:
+                    print(f"  🔁 Near-duplicate of {match.canonical_key} (similarity {match.similarity:.2f})")
+                    article_data["prediction"] = match.prediction
                 else:
                     model_dir = os.path.join('..', 'models', 'finbert_bitcoin_sentiment')
                     tokenizer = AutoTokenizer.from_pretrained(model_dir)
@@ -204,6 +227,8 @@ def scrape_full_coinmarketcap_articles():
                     # Use the truncated text for prediction
                     print(predict(TextIn(text=truncated_text)).label)
                     article_data["prediction"] = predict(TextIn(text=truncated_text)).label
+
+                article_data["canonical_url"] = near_dup_index.add(url, dedup_text, article_data["prediction"]) or url
                 all_articles_data.append(article_data)
 
                 # Save new article to database
@@ -216,7 +241,10 @@ def scrape_full_coinmarketcap_articles():
                 print(f"  ❌ Could not process article {url}. Reason: {e}")
 
     finally:
-        driver.quit()
+        if pool is not None:
+            pool.close()
+        if near_dup_index.modified:
+            near_dup_index.save(NEAR_DUP_INDEX_PATH)
 
     return all_articles_data
 
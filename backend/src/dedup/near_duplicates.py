@@ -0,0 +1,276 @@
+import os
+import re
+import zlib
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+import numpy as np
+from loguru import logger
+
+# Hash universe for the MinHash permutations. Shingle hashes are 32-bit and the
+# permutation coefficients stay below 2**31, so (a * x + b) fits in uint64.
+_PRIME = np.uint64((1 << 31) - 1)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# CryptoPanic descriptions are roughly the lead of the article, so the corpus
+# and the scraper both fingerprint the title plus this many leading words
+FINGERPRINT_WORDS = 40
+
+
+class NearDuplicateMatch(NamedTuple):
+    canonical_key: str
+    similarity: float
+    prediction: Optional[str]
+
+
+def article_fingerprint(title: Optional[str], body: Optional[str], max_words: int = FINGERPRINT_WORDS) -> str:
+    """
+    Text indexed for an article: its title plus the first `max_words` words of
+    the body. Using the lead keeps a full scraped article comparable with a
+    one-sentence description of the same story.
+    """
+    lead = " ".join((body or "").split()[:max_words])
+    return f"{title or ''}\n{lead}"
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    Pick the (bands, rows) split whose LSH S-curve midpoint, (1/b) ** (1/r),
+    is closest to the requested Jaccard threshold.
+    """
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index over word shingles of news articles.
+
+    Every indexed article belongs to a cluster represented by a canonical key
+    (the first article seen). Near-duplicates found by `query` can reuse the
+    cluster prediction instead of being scored again.
+
+    Signatures live in a single uint32 matrix and are saved with the keys and
+    cluster data as plain arrays in an .npz file. Rows loaded from disk are
+    looked up through per-band sorted arrays, rows added since go in dict buckets.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 3,
+        seed: int = 42,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = _optimal_bands(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        # Multipliers that fold each band of a signature into one uint64 bucket key
+        self._band_multipliers = rng.integers(
+            1, np.iinfo(np.int64).max, size=self.rows, dtype=np.uint64
+        ) | np.uint64(1)
+
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._canonical_rows: list[int] = []
+        self._predictions: dict[int, str] = {}
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._sorted_band_keys = np.empty((self.bands, 0), dtype=np.uint64)
+        self._sorted_rows = np.empty((self.bands, 0), dtype=np.intp)
+        self.modified = False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def shingles(self, text: str) -> set[str]:
+        """
+        Lowercased word k-shingles. Texts shorter than k words yield a single
+        shingle so short headlines are still indexable.
+        """
+        tokens = _TOKEN_PATTERN.findall(text.lower()) if text else []
+        if not tokens:
+            return set()
+        k = min(self.shingle_size, len(tokens))
+        return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a text, or None if it has no words."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (self._a * hashes + self._b) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Bucket key of every band, shape (n_signatures, bands)."""
+        banded = signatures[:, :self.bands * self.rows].astype(np.uint64)
+        banded = banded.reshape(len(signatures), self.bands, self.rows)
+        return (banded * self._band_multipliers).sum(axis=2)
+
+    def query(self, text: str) -> Optional[NearDuplicateMatch]:
+        """
+        Return the most similar indexed cluster whose estimated Jaccard
+        similarity reaches the threshold, or None.
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+
+        row = self._query_signature(signature)
+        if row is None:
+            return None
+
+        canonical_row = self._canonical_rows[row[0]]
+        return NearDuplicateMatch(
+            canonical_key=self._keys[canonical_row],
+            similarity=row[1],
+            prediction=self._predictions.get(canonical_row),
+        )
+
+    def _query_signature(self, signature: np.ndarray) -> Optional[tuple[int, float]]:
+        candidates = set()
+        band_keys = self._band_keys(signature[np.newaxis, :])[0]
+        for band, band_key in enumerate(band_keys):
+            sorted_keys = self._sorted_band_keys[band]
+            start = np.searchsorted(sorted_keys, band_key, side="left")
+            end = np.searchsorted(sorted_keys, band_key, side="right")
+            candidates.update(self._sorted_rows[band, start:end].tolist())
+        for bucket, band_key in zip(self._buckets, band_keys.tolist()):
+            candidates.update(bucket.get(band_key, ()))
+        if not candidates:
+            return None
+
+        rows = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        similarities = (self._signatures[rows] == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return int(rows[best]), float(similarities[best])
+
+    def _append(self, key: str, signature: np.ndarray, canonical_row: int) -> None:
+        row = len(self._keys)
+        if row == len(self._signatures):
+            self._signatures = np.resize(self._signatures, (2 * row, self.num_perm))
+        self._signatures[row] = signature
+        self._keys.append(key)
+        self._rows[key] = row
+        self._canonical_rows.append(canonical_row)
+
+    def add(self, key: str, text: str, prediction: Optional[str] = None) -> Optional[str]:
+        """
+        Index an article and return the canonical key of its cluster.
+
+        The article joins the cluster of its closest near-duplicate, or starts a
+        new one. Returns None if the text has no words to index.
+        """
+        if key in self._rows:
+            return self._keys[self._canonical_rows[self._rows[key]]]
+
+        signature = self.signature(text)
+        if signature is None:
+            return None
+
+        match = self._query_signature(signature)
+        row = len(self._keys)
+        canonical_row = self._canonical_rows[match[0]] if match else row
+
+        self._append(key, signature, canonical_row)
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature[np.newaxis, :])[0].tolist()):
+            bucket[band_key].append(row)
+
+        if prediction is not None and canonical_row not in self._predictions:
+            self._predictions[canonical_row] = prediction
+        self.modified = True
+
+        return self._keys[canonical_row]
+
+    def canonical_key(self, key: str) -> Optional[str]:
+        row = self._rows.get(key)
+        return None if row is None else self._keys[self._canonical_rows[row]]
+
+    def set_prediction(self, key: str, prediction: str) -> None:
+        """Store the prediction for the cluster that `key` belongs to."""
+        self._predictions[self._canonical_rows[self._rows[key]]] = prediction
+        self.modified = True
+
+    def save(self, path: str) -> None:
+        """Atomically persist the index to `path` as an .npz file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        prediction_rows = np.fromiter(self._predictions.keys(), dtype=np.int64, count=len(self._predictions))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                params=np.array([self.threshold, self.num_perm, self.shingle_size, self.seed], dtype=np.float64),
+                signatures=self._signatures[:len(self._keys)],
+                keys=np.array(self._keys, dtype=np.str_),
+                canonical_rows=np.array(self._canonical_rows, dtype=np.int64),
+                prediction_rows=prediction_rows,
+                predictions=np.array(list(self._predictions.values()), dtype=np.str_),
+            )
+        os.replace(tmp_path, path)
+        self.modified = False
+
+    @classmethod
+    def load(cls, path: str) -> "NearDuplicateIndex":
+        with np.load(path, allow_pickle=False) as data:
+            threshold, num_perm, shingle_size, seed = data["params"].tolist()
+            index = cls(
+                threshold=threshold,
+                num_perm=int(num_perm),
+                shingle_size=int(shingle_size),
+                seed=int(seed),
+            )
+            index._signatures = data["signatures"]
+            index._keys = data["keys"].tolist()
+            index._canonical_rows = data["canonical_rows"].tolist()
+            index._predictions = dict(zip(data["prediction_rows"].tolist(), data["predictions"].tolist()))
+
+        index._rows = {key: row for row, key in enumerate(index._keys)}
+        if len(index._keys):
+            band_keys = index._band_keys(index._signatures).T
+            index._sorted_rows = np.argsort(band_keys, axis=1, kind="stable")
+            index._sorted_band_keys = np.take_along_axis(band_keys, index._sorted_rows, axis=1)
+        else:
+            index._signatures = np.empty((1024, index.num_perm), dtype=np.uint32)
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: str, **kwargs) -> "NearDuplicateIndex":
+        """
+        Load the index stored at `path`, or create an empty one with `kwargs`.
+        Thresholds are fixed at creation time since they shape the LSH bands.
+        """
+        if os.path.exists(path):
+            return cls.load(path)
+        logger.warning(f"No near-duplicate index at {path}, starting an empty one")
+        return cls(**kwargs)
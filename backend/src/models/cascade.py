@@ -0,0 +1,89 @@
+import os
+from collections import Counter
+from typing import Optional
+
+import joblib
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+CASCADE_MODEL_PATH = os.path.join('..', 'models', 'cascade_linear.joblib')
+
+
+class CascadeClassifier:
+    """
+    First stage of the cascade: TF-IDF + logistic regression.
+
+    `predict` answers only when the top class probability reaches the tuned
+    threshold, otherwise it returns None and the text escalates to FinBERT.
+    """
+
+    def __init__(self, pipeline: Pipeline, threshold: float):
+        self.pipeline = pipeline
+        self.threshold = threshold
+
+        # Unpack the fitted pipeline so a single text skips sklearn's per-call
+        # validation, which costs far more than the model itself
+        self._vectorizer = pipeline.named_steps["tfidf"]
+        self._analyzer = self._vectorizer.build_analyzer()
+        self._vocabulary = self._vectorizer.vocabulary_
+        self._idf = self._vectorizer.idf_ if self._vectorizer.use_idf else None
+
+        classifier = pipeline.named_steps["clf"]
+        self._coef_t = np.ascontiguousarray(classifier.coef_.T)
+        self._intercept = classifier.intercept_
+        self._classes = classifier.classes_
+
+    def _probabilities(self, logits: np.ndarray) -> np.ndarray:
+        if len(self._classes) == 2:
+            positive = 1 / (1 + np.exp(-logits[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def _logits_single(self, text: str) -> np.ndarray:
+        """Same weighting as TfidfVectorizer.transform, for one text."""
+        counts = Counter(
+            index for index in map(self._vocabulary.get, self._analyzer(text)) if index is not None
+        )
+        if not counts:
+            return self._intercept.copy()
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self._vectorizer.binary:
+            weights[:] = 1
+        if self._vectorizer.sublinear_tf:
+            weights = 1 + np.log(weights)
+        if self._idf is not None:
+            weights *= self._idf[indices]
+        if self._vectorizer.norm == "l2":
+            weights /= np.linalg.norm(weights)
+        elif self._vectorizer.norm == "l1":
+            weights /= np.abs(weights).sum()
+
+        return weights @ self._coef_t[indices] + self._intercept
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        logits = self._vectorizer.transform(texts) @ self._coef_t + self._intercept
+        return self._probabilities(logits)
+
+    def predict(self, text: str) -> Optional[tuple[str, float]]:
+        probabilities = self._probabilities(self._logits_single(text)[np.newaxis, :])[0]
+        best = int(np.argmax(probabilities))
+        score = float(probabilities[best])
+        if score < self.threshold:
+            return None
+        return str(self._classes[best]), score
+
+    def save(self, path: str) -> None:
+        # Only the sklearn pipeline and threshold are stored, the fast path is rebuilt
+        # on load. Written atomically since the API reloads the file when it changes.
+        tmp_path = f"{path}.tmp"
+        joblib.dump({"pipeline": self.pipeline, "threshold": self.threshold}, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CascadeClassifier":
+        data = joblib.load(path)
+        return cls(pipeline=data["pipeline"], threshold=data["threshold"])
@@ -0,0 +1,10 @@
+def to_finbert_labels(labels: list[str], id2label: dict[int, str]) -> list[str]:
+    """
+    Map labels from another source (e.g. the GPT-labeled corpus) onto FinBERT's
+    label names, ignoring case, so predictions share a single label set.
+    """
+    finbert_label_names = {label.lower(): label for label in id2label.values()}
+    unknown_labels = {label for label in labels if label.lower() not in finbert_label_names}
+    if unknown_labels:
+        raise ValueError(f"Labels {unknown_labels} are not FinBERT labels {list(finbert_label_names.values())}")
+    return [finbert_label_names[label.lower()] for label in labels]
@@ -1,9 +1,14 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 
 class TextIn(BaseModel):
     text: str
+    # "cascade" tries the linear model first and escalates to FinBERT
+    mode: Literal["finbert", "cascade"] = "finbert"
 
 class SentimentOut(BaseModel):
     label: str
-    score: float
\ No newline at end of file
+    score: float
+    stage: Literal["linear", "finbert"] = "finbert"
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, BackgroundTasks
+from backend.src.tasks.cascade_training import train_cascade
+
+router = APIRouter()
+
+
+@router.post("/cascade-training")
+def cascade_training(background_tasks: BackgroundTasks):
+    background_tasks.add_task(train_cascade)
+    return {"message": "Training cascade model"}
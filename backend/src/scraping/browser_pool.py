@@ -0,0 +1,223 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from loguru import logger
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Resources the scraper never reads: only the DOM text is parsed. The trailing
+# wildcard also matches CDN URLs with a query string, e.g. img.png?w=64
+BLOCKED_URL_PATTERNS = [
+    # images
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*",
+    # media
+    "*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.ogg*", "*.wav*",
+    # fonts
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+]
+
+CHROMEDRIVER_PATH_CACHE = os.getenv(
+    "CHROMEDRIVER_PATH_CACHE", os.path.join("..", "data", "chromedriver_path.txt")
+)
+
+
+def resolve_chromedriver_path() -> str:
+    """
+    Return a local chromedriver binary without a network lookup when possible.
+
+    `CHROMEDRIVER_PATH` wins if set. Otherwise the path installed by
+    webdriver-manager on a previous run is read from `CHROMEDRIVER_PATH_CACHE`,
+    and only a missing binary triggers a new download.
+    """
+    driver_path = os.getenv("CHROMEDRIVER_PATH")
+    if driver_path:
+        return driver_path
+
+    if os.path.exists(CHROMEDRIVER_PATH_CACHE):
+        with open(CHROMEDRIVER_PATH_CACHE) as f:
+            driver_path = f.read().strip()
+        if driver_path and os.path.exists(driver_path):
+            return driver_path
+
+    logger.info("No cached chromedriver found, installing with webdriver-manager")
+    return install_chromedriver()
+
+
+def install_chromedriver() -> str:
+    """Install the chromedriver matching the local Chrome and cache its path."""
+    driver_path = ChromeDriverManager().install()
+
+    directory = os.path.dirname(CHROMEDRIVER_PATH_CACHE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(CHROMEDRIVER_PATH_CACHE, "w") as f:
+        f.write(driver_path)
+
+    return driver_path
+
+
+def build_chrome_options() -> webdriver.ChromeOptions:
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_experimental_option(
+        "prefs", {"profile.managed_default_content_settings.images": 2}
+    )
+    # Don't wait for subresources, the explicit waits decide when a page is ready
+    options.page_load_strategy = "eager"
+    return options
+
+
+class BrowserPool:
+    """
+    Pool of warm headless Chrome sessions shared by concurrent workers.
+
+    Drivers are started once for the whole run and handed out with `acquire`.
+    Images, media and fonts are blocked through the DevTools protocol.
+    """
+
+    def __init__(
+        self,
+        size: int = 3,
+        wait_timeout: float = 10,
+        page_load_timeout: float = 30,
+        acquire_timeout: float = 120,
+        driver_path: Optional[str] = None,
+    ):
+        self.size = size
+        self.wait_timeout = wait_timeout
+        self.page_load_timeout = page_load_timeout
+        self.acquire_timeout = acquire_timeout
+        self.driver_path = driver_path or resolve_chromedriver_path()
+        self._options = build_chrome_options()
+        self._drivers: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(self._start_driver) for _ in range(size)]
+        started = [future.result() for future in futures if future.exception() is None]
+        failures = [future.exception() for future in futures if future.exception() is not None]
+        if failures:
+            # Don't leak the sessions that did start
+            for driver in started:
+                self._quit(driver)
+            raise failures[0]
+
+        for driver in started:
+            self._drivers.put(driver)
+        self._alive = size
+        logger.info(f"Browser pool ready with {size} Chrome sessions")
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _start_driver(self) -> webdriver.Chrome:
+        driver_path = self.driver_path
+        try:
+            return self._launch(driver_path)
+        except SessionNotCreatedException:
+            # Usually a cached chromedriver that no longer matches an upgraded Chrome
+            with self._lock:
+                if self.driver_path == driver_path:
+                    logger.warning("chromedriver doesn't match the local Chrome, reinstalling it")
+                    self.driver_path = install_chromedriver()
+            return self._launch(self.driver_path)
+
+    def _launch(self, driver_path: str) -> webdriver.Chrome:
+        driver = webdriver.Chrome(service=Service(driver_path), options=self._options)
+        try:
+            driver.set_page_load_timeout(self.page_load_timeout)
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except WebDriverException:
+            self._quit(driver)
+            raise
+        return driver
+
+    @contextmanager
+    def acquire(self) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a driver, waiting up to `acquire_timeout` seconds for one to be
+        free. A driver that raised a WebDriverException is replaced by a fresh
+        session. Raises RuntimeError when no session is left or none frees up.
+        """
+        if self._alive == 0:
+            raise RuntimeError("No Chrome session left in the browser pool")
+        try:
+            driver = self._drivers.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f"No Chrome session available after {self.acquire_timeout}s "
+                f"({self._alive} of {self.size} alive)"
+            ) from None
+        healthy = True
+        try:
+            yield driver
+        except TimeoutException:
+            # A slow page doesn't mean the session is broken
+            raise
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._drivers.put(driver)
+            else:
+                self._replace(driver)
+
+    def _replace(self, driver: webdriver.Chrome) -> None:
+        logger.warning("Chrome session failed, replacing it")
+        self._quit(driver)
+        try:
+            self._drivers.put(self._start_driver())
+        except Exception as e:
+            with self._lock:
+                self._alive -= 1
+            logger.error(f"Could not restart Chrome session, {self._alive} of {self.size} left: {e}")
+
+    @staticmethod
+    def _quit(driver: webdriver.Chrome) -> None:
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.warning(f"Error closing Chrome session: {e}")
+
+    def get_page_source(self, url: str, wait_selector: Optional[str] = None) -> str:
+        """
+        Load `url` and return its HTML once `wait_selector` (a CSS selector)
+        is present, or after `wait_timeout` seconds if it never shows up.
+        """
+        with self.acquire() as driver:
+            driver.get(url)
+            if wait_selector:
+                try:
+                    WebDriverWait(driver, self.wait_timeout).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                    )
+                except TimeoutException:
+                    logger.warning(f"Timed out waiting for '{wait_selector}' on {url}")
+            return driver.page_source
+
+    def close(self) -> None:
+        while not self._drivers.empty():
+            self._quit(self._drivers.get_nowait())
@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pandas as pd
+import torch
+from dotenv import load_dotenv
+from loguru import logger
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from transformers import pipeline
+
+from backend.src.models.cascade import CASCADE_MODEL_PATH, CascadeClassifier
+from backend.src.models.labels import to_finbert_labels
+
+load_dotenv()
+
+CLEAN_DATA_FOLDER = os.getenv("CLEAN_DATA_FOLDER", "/data/clean")
+FINBERT_MODEL_DIR = os.path.join("..", "models", "finbert_bitcoin_sentiment_pretrained")
+
+
+def select_threshold(
+    confidences: np.ndarray,
+    linear_labels: np.ndarray,
+    finbert_labels: np.ndarray,
+    target_agreement: float,
+) -> tuple[float, float, float]:
+    """
+    Pick the lowest confidence threshold whose cascade output still agrees
+    with FinBERT on at least `target_agreement` of the texts.
+
+    Escalated texts are answered by FinBERT itself, so only the mistakes of
+    the linear stage count against the agreement. Returns
+    (threshold, coverage, agreement), where coverage is the share of texts
+    answered by the linear stage.
+    """
+    n = len(confidences)
+    order = np.argsort(-confidences, kind="stable")
+    sorted_confidences = confidences[order]
+    disagreements = np.cumsum(linear_labels[order] != finbert_labels[order])
+    agreement = 1 - disagreements / n
+
+    # A threshold answers every text with the same confidence, so only cut
+    # between distinct confidence values
+    cut_allowed = np.append(sorted_confidences[:-1] > sorted_confidences[1:], True)
+    valid = np.flatnonzero(cut_allowed & (agreement >= target_agreement))
+    if len(valid) == 0:
+        return float("inf"), 0.0, 1.0
+
+    k = valid[-1]
+    return float(sorted_confidences[k]), (k + 1) / n, float(agreement[k])
+
+
+def train_cascade(target_agreement: float = 0.95, max_escalation_samples: int = 5000):
+    logger.info("Starting cascade training...")
+
+    df = pd.read_parquet(f"{CLEAN_DATA_FOLDER}/cryptopanic_news_clean_with_labels.parquet")
+    texts = (df["title"].fillna("") + ". " + df["description"].fillna("")).tolist()
+
+    device = 0 if torch.cuda.is_available() else -1
+    finbert = pipeline(
+        task="sentiment-analysis", model=FINBERT_MODEL_DIR, batch_size=128, device=device
+    )
+
+    # Use FinBERT's label names so both stages answer with the same labels
+    labels = to_finbert_labels(df["sentiment"].tolist(), finbert.model.config.id2label)
+
+    texts_train, texts_val, labels_train, _ = train_test_split(
+        texts, labels, test_size=0.2, random_state=42, stratify=labels
+    )
+    texts_val = texts_val[:max_escalation_samples]
+
+    linear_pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True)),
+        ("clf", LogisticRegression(max_iter=1000)),
+    ])
+    linear_pipeline.fit(texts_train, labels_train)
+    logger.info(f"Linear stage trained on {len(texts_train)} texts")
+
+    # Threshold is tuned against FinBERT's answers, not the labels, since
+    # the cascade replaces FinBERT
+    finbert_labels = np.array(
+        [result["label"] for result in finbert(texts_val, truncation=True, max_length=512)]
+    )
+
+    cascade = CascadeClassifier(linear_pipeline, threshold=0.0)
+    probabilities = cascade.predict_proba(texts_val)
+    confidences = probabilities.max(axis=1)
+    linear_labels = linear_pipeline.classes_[probabilities.argmax(axis=1)]
+
+    threshold, coverage, agreement = select_threshold(
+        confidences, linear_labels, finbert_labels, target_agreement
+    )
+    logger.info(
+        f"Threshold {threshold:.4f}: linear stage answers {coverage:.1%} of texts, "
+        f"cascade agrees with FinBERT on {agreement:.1%} (target {target_agreement:.1%})"
+    )
+
+    cascade.threshold = threshold
+    cascade.save(CASCADE_MODEL_PATH)
+
+    logger.info(f"Cascade model saved to {CASCADE_MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    train_cascade()